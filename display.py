@@ -100,7 +100,11 @@ def simulation(machines_settings, mode):
                 # check in all transition
                 for transition in transitions:
 
-                    if transition.get("from") == data["actual_state"][0]:
+                    # Hoist the dict lookups: each is reused several times below
+                    transition_from = transition.get("from")
+                    transition_to = transition.get("to")
+
+                    if transition_from == data["actual_state"][0]:
 
                         event_val = transition.get("event", "")
 
@@ -113,7 +117,7 @@ def simulation(machines_settings, mode):
                                 f"{option }",
                                 f"{actual_machine}",
                                 f"{type_transition}",
-                                f"{transition.get('from')} --{event_content}--> {transition.get('to')}",
+                                f"{transition_from} --{event_content}--> {transition_to}",
                             )
 
                             choice_metadata.append(
@@ -137,7 +141,7 @@ def simulation(machines_settings, mode):
                                 f"{option }",
                                 f"{actual_machine}",
                                 f"{type_transition}",
-                                f"{transition.get('from')} --{event_content}--> {transition.get('to')}",
+                                f"{transition_from} --{event_content}--> {transition_to}",
                             )
 
                             choice_metadata.append(
@@ -171,7 +175,7 @@ def simulation(machines_settings, mode):
                                         f"{option}",
                                         f"{actual_machine}",
                                         f"{type_transition}",
-                                        f"{transition.get('from')} --{event_content}--> {transition.get('to')}",
+                                        f"{transition_from} --{event_content}--> {transition_to}",
                                     )
 
                                     choice_metadata.append(
@@ -418,21 +422,22 @@ def display_available_transition(machines_settings, machine_name):
             # console.print(f"here allstates {allStates} and try to remove {focusState}")
 
             # check in all transition
+            actual_state = data["actual_state"][0]
             for transition in transitions:
                 # search wich transition is available, by creating 1. a list of reachable state 2. and possible_event use to save event when only one transition
-                if transition.get("from") == data["actual_state"][0]:
+                if transition.get("from") == actual_state:
+                    transition_to = transition.get("to")
+                    transition_event = transition.get("event")
+                    # Build the display line directly, no join/split round-trip
                     transitionToDisplay.append(
-                        f"{transition.get('to')} with {transition.get('event')}"
+                        f"│   └─ [green]{transition_to}[/green] via event [green]{transition_event}[/green]\n"
                     )
-                    transitionTo.append(f"{transition.get('to')}")
-                    possible_event.append(f"{transition.get('event')}")
+                    transitionTo.append(f"{transition_to}")
+                    possible_event.append(f"{transition_event}")
 
                     # when is the last state so if the fsm is infinite it should go back to initalState
             content_to_print += f"├─ Available transitions:\n"
-
-            for t in transitionToDisplay:
-                state, event_val = t.split(" with ")
-                content_to_print += f"│   └─ [green]{state}[/green] via event [green]{event_val}[/green]\n"
+            content_to_print += "".join(transitionToDisplay)
 
             # if multiple transition is available -> APPLY
             # type 2 and type 3
@@ -1,134 +1,115 @@
-import yaml
 import argparse
-from time import sleep
+import copy
+import functools
+import mmap
+import os
+import sys
 
 """
 python3 -m pip install rich
 python3 -m pip install rich-cli
 """
 from rich.console import Console
-from rich.table import Table
-
-from display import *
-import random
 
 # Initialize the console for rich text output
 console = Console()
 
 
-def settings_read(file_path):
-    # Print the settings in a table
-    with open(file_path, "r") as file:
-        content = yaml.safe_load(file)  # Load and parse the YAML file
-
-        machines = content.items()
-
-        # Create a table for displaying the settings
-        console.print(f"Imported Settings:", style="bold cyan")
-        table_settings = Table(show_header=True, header_style="bold cyan")
-        table_settings.add_column("Machine name", style="dim", width=12)
-        table_settings.add_column("Inital global state")
-        table_settings.add_column("All possible state", style="dim", width=20)
-        table_settings.add_column("Transition (Event | change of states)")
-
-        for machine, machine_data in content.items():
-            # Initialise
-
-            row_content = [machine]
-
-            initial_global_state = ", ".join(
-                machine_data["Initial_global_state"]
-            )  # For table
-            row_content.append(initial_global_state)
-
-            states = ", ".join(machine_data["States"])
-            row_content.append(states)
-            transitions = machine_data["Transitions"]
-
-            # For checking if the fsm are infinite
-            listOfto = []
-            listOfStates = machine_data["States"]
-
-            # Create the row content for each state
-            # Find all transitions where the 'from' state is the current state
-            transition_info = []
-            i = 1
-            for transition in transitions:
-
-                if i > 1:
-                    transition_info = []
-                    row_content = []
-                    row_content.append("")
-                    row_content.append("")
-                    row_content.append("")
-
-                transition_info.append(transition.get("event", "N/A"))
-                transition_info.append(
-                    f"({transition.get('from')} -> {transition.get('to')})"
-                )
-                listOfto.append(f"{transition.get('to')}")
-
-                # If there are transitions, join them with a comma. Otherwise, display "No transitions"
-                if transition_info:
-                    row_content.append(" | ".join(transition_info))
-
-                else:
-                    row_content.append("No transitions")
-                i = i + 1
-
-                table_settings.add_row(*row_content)
-            # check if the fsm is infinte or not
-            if all(state in listOfto for state in listOfStates) == False:
-                raise ValueError(
-                    f"The FSM '{machine}' is not infinite: some states cannot be reached (no transition leads to them)."
-                )
-        # Print the table
-        console.print(table_settings)
-        return tuple(machines)
+def _yaml_loader():
+    # PyYAML is imported on first use so --help never pays for it; later
+    # calls hit Python's module cache. Prefer the libyaml C loader when
+    # PyYAML was built with it (much faster parsing)
+    import yaml
 
+    return yaml, getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-def update_machine_file(file_path):
-    machines = file_path
-    updated_machines = []
-
-    for name, data in machines:
-
-        # create All states map for the end of the simulation show possible non executable state
-        updated_states = [[state, 0] for state in data["States"]]
-        data["States"] = updated_states
 
-        data["actual_state"] = data[
-            "Initial_global_state"
-        ]  # put the actual states by the values of the inital states
-
-        machine_names_list = [name for name, _ in machines]
-        machine_names_list.remove(name)
-
-        for other_machines_names in machine_names_list:
-            data[f"Channel {name} -> {other_machines_names}"] = []
-
-        updated_machines.append((name, data))
-
-    # Optional: print to verify
-    # console.print(updated_machines)
-    return updated_machines
+@functools.lru_cache(maxsize=8)
+def _load_yaml_cached(file_path, mtime):
+    # mtime is only part of the cache key, so a modified file is re-parsed
+    # Hand the parser a memory-mapped buffer: one syscall, no userspace copy
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            return None  # mmap refuses empty files; match yaml.load(<empty>)
+        yaml, loader = _yaml_loader()
+        buffer = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        try:
+            return yaml.load(buffer, Loader=loader)
+        finally:
+            buffer.close()
+    finally:
+        os.close(fd)
+
+
+def _load_yaml(file_path):
+    # Parse a YAML file once and reuse the result on later calls. The path
+    # is resolved first so aliases of the same file ('./x.yaml', 'x.yaml',
+    # symlinks) share one cache entry instead of being parsed twice.
+    # Callers get a deep copy: update_machine_file mutates the machine
+    # dicts in place, which would otherwise poison the cache entry
+    file_path = os.path.realpath(file_path)
+    return copy.deepcopy(_load_yaml_cached(file_path, os.path.getmtime(file_path)))
+
+
+# Accepted settings file extensions (case-insensitive)
+_YAML_EXTS = frozenset({"yaml", "yml"})
+
+
+# Minimal ANSI palette for the plain renderer (no Rich on this path)
+_ANSI = {
+    "reset": "\x1b[0m",
+    "bold_cyan": "\x1b[1;36m",
+    "dim": "\x1b[2m",
+}
+
+
+def _print_plain_table(headers, rows):
+    # Render the settings table with str.ljust and raw ANSI codes,
+    # skipping Rich's per-cell measurement entirely
+    widths = [len(header) for header in headers]
+    for row in rows:
+        for column, cell in enumerate(row):
+            widths[column] = max(widths[column], len(cell))
+
+    out = sys.stdout.write
+    out(f"{_ANSI['bold_cyan']}Imported Settings:{_ANSI['reset']}\n")
+    out(
+        _ANSI["bold_cyan"]
+        + "  ".join(header.ljust(width) for header, width in zip(headers, widths))
+        + _ANSI["reset"]
+        + "\n"
+    )
+    out(_ANSI["dim"] + "  ".join("-" * width for width in widths) + _ANSI["reset"] + "\n")
+    for row in rows:
+        out("  ".join(cell.ljust(width) for cell, width in zip(row, widths)) + "\n")
 
 
-def validate_settings_file(file_path):
+def process_settings(content, plain=False):
+    # Fused validate + render over the already-parsed settings dict; every
+    # machine's transitions list is walked exactly once
     try:
-        with open(file_path, "r") as file:
-            content = yaml.safe_load(file)
-            # Check if there are at least two machines if len(content) < 2:
-            # Check if there are at least two machines
+        # Check if there are at least two machines
         if len(content) < 2:
             raise ValueError(
                 "There must be at least two machines in the settings file."
             )
 
-        all_machine_names = list(content.keys())
+        # Built once and reused for every machine's channel checks
+        all_machine_names = set(content.keys())
+
+        headers = [
+            "Machine name",
+            "Inital global state",
+            "All possible state",
+            "Transition (Event | change of states)",
+        ]
+
+        # Collect every row first, then hand them to the renderer in one batch
+        rows = []
 
-        # Check that every machine has at least one initial state
         for machine_name, machine_data in content.items():
+            # Check that every machine has at least one initial state
             if "Initial_global_state" not in machine_data:
                 raise ValueError(
                     f"Machine '{machine_name}' is missing an 'initial_global_state'."
@@ -144,7 +125,24 @@ def validate_settings_file(file_path):
                     f"Machine '{machine_name}' must have at least one transition defined."
                 )
 
-            for transition in machine_data.get("Transitions", []):
+            # A plain string is shown as-is: joining it would splice a comma
+            # between every character, and skipping the join saves a buffer
+            initial_state = machine_data["Initial_global_state"]
+            if not isinstance(initial_state, str):
+                initial_state = ", ".join(initial_state)
+
+            row_content = [
+                machine_name,
+                initial_state,  # For table
+                ", ".join(machine_data["States"]),
+            ]
+
+            # For checking if the fsm are infinite (set -> O(1) membership tests)
+            reachable_states = set()
+
+            # One pass per transition: validate it and build its table cell
+            first_row = True
+            for transition in transitions:
 
                 if (
                     "from" not in transition
@@ -163,9 +161,11 @@ def validate_settings_file(file_path):
                     )
 
                 if event_val.startswith(("-", "!")):
-                    other_machines = [m for m in all_machine_names if m != machine_name]
-
-                    if channel_content not in other_machines:
+                    # valid target = any machine in the file except this one
+                    if (
+                        channel_content not in all_machine_names
+                        or channel_content == machine_name
+                    ):
                         if channel_content == "":
                             raise ValueError(
                                 f"❌ You should specify a channel to point in to FSM : it must be not empty a sending event need a parameter channel to point to."
@@ -174,22 +174,134 @@ def validate_settings_file(file_path):
                             f"❌ FSM '{machine_name}': Sending events require a 'channel' parameter that points to a valid target FSM. This field cannot be empty or not defined."
                         )
 
-        # If all checks pass
-        return True, "Settings file is valid."
+                if not first_row:
+                    row_content = ["", "", ""]
+                first_row = False
+
+                transition_to = transition.get("to")
+                reachable_states.add(f"{transition_to}")
+
+                # Format the cell directly instead of joining a temporary list
+                row_content.append(
+                    f"{event_val} | ({transition.get('from')} -> {transition_to})"
+                )
+
+                rows.append(row_content)
+
+            # check if the fsm is infinte or not
+            if all(state in reachable_states for state in machine_data["States"]) == False:
+                raise ValueError(
+                    f"The FSM '{machine_name}' is not infinite: some states cannot be reached (no transition leads to them)."
+                )
+
+        # Fill and print the table in one go
+        if plain:
+            _print_plain_table(headers, rows)
+        else:
+            from rich.table import Table
+
+            console.print(f"Imported Settings:", style="bold cyan")
+            table_settings = Table(show_header=True, header_style="bold cyan")
+            table_settings.add_column(headers[0], style="dim", width=12)
+            table_settings.add_column(headers[1])
+            table_settings.add_column(headers[2], style="dim", width=20)
+            table_settings.add_column(headers[3])
+            for row in rows:
+                table_settings.add_row(*row)
+            console.print(table_settings)
+
+        return tuple(content.items())
 
     except ValueError as e:
         console.print(f"[bold red]Error in settings files[/bold red]: {e}")
-        return False
+        return None
 
 
-def read_yaml_file(file_path):
-    # Open the YAML file and read its content
+def update_machine_file(file_path):
+    machines = file_path
+    updated_machines = []
+
+    for name, data in machines:
+
+        # create All states map for the end of the simulation show possible non executable state
+        updated_states = [[state, 0] for state in data["States"]]
+        data["States"] = updated_states
+
+        data["actual_state"] = data[
+            "Initial_global_state"
+        ]  # put the actual states by the values of the inital states
+
+        machine_names_list = [name for name, _ in machines]
+        machine_names_list.remove(name)
+
+        for other_machines_names in machine_names_list:
+            data[f"Channel {name} -> {other_machines_names}"] = []
+
+        updated_machines.append((name, data))
+
+    # Optional: print to verify
+    # console.print(updated_machines)
+    return updated_machines
+
+
+def _stream_check_settings(file_path):
+    # Check the top-level shape with the event stream before paying for a
+    # full parse, so a malformed file is rejected on the first bad event
+    yaml, loader = _yaml_loader()
     with open(file_path, "r") as file:
-        content = yaml.safe_load(file)  # Load and parse the YAML file
+        events = yaml.parse(file, Loader=loader)
 
-        # Print the content of the YAML file
-        console.print("\nContent of the file:", style="bold cyan")
-        console.print(content, style="italic green")
+        # The document must start with a mapping (machine name -> settings)
+        for event in events:
+            if isinstance(event, yaml.MappingStartEvent):
+                break
+            if isinstance(event, (yaml.ScalarEvent, yaml.SequenceStartEvent)):
+                raise ValueError(
+                    "The settings file must be a mapping of machine definitions."
+                )
+        else:
+            raise ValueError("The settings file is empty.")
+
+        # Walk the rest of the stream: every top-level value must be a mapping
+        depth = 1
+        expecting_key = True
+        machine_name = None
+        for event in events:
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                if depth == 1:
+                    if expecting_key:
+                        raise ValueError("Machine names must be plain strings.")
+                    if isinstance(event, yaml.SequenceStartEvent):
+                        raise ValueError(
+                            f"Machine '{machine_name}' must be a mapping of settings."
+                        )
+                    expecting_key = True
+                depth += 1
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+                if depth == 0:
+                    break
+            elif isinstance(event, yaml.ScalarEvent) and depth == 1:
+                if expecting_key:
+                    machine_name = event.value
+                    expecting_key = False
+                else:
+                    raise ValueError(
+                        f"Machine '{machine_name}' must be a mapping of settings."
+                    )
+            elif isinstance(event, yaml.AliasEvent) and depth == 1:
+                # An alias (*anchor) is a complete node; as a value it reuses
+                # an anchored machine definition, which the full parse resolves
+                expecting_key = not expecting_key
+
+
+def read_yaml_file(file_path):
+    # Read the YAML file content (cached, so repeated reads are free)
+    content = _load_yaml(file_path)
+
+    # Print the content of the YAML file
+    console.print("\nContent of the file:", style="bold cyan")
+    console.print(content, style="italic green")
 
 
 # Start the simulation
@@ -209,7 +321,7 @@ def choose_simulation_mode():
             console.print("[bold red]Please select a valid options[/bold red]")
 
 
-def main():
+def _build_parser():
     # Set up argument parsing
     parser = argparse.ArgumentParser(
         description="Simulator, executor for N protocol entities"
@@ -223,19 +335,40 @@ def main():
         required=True,
     )
 
+    parser.add_argument(
+        "--plain",
+        action="store_true",
+        help="Render the imported settings table with plain text instead of Rich",
+    )
+
+    return parser
+
+
+# Built once at import so repeated main() calls reuse the same parser
+_PARSER = _build_parser()
+
+
+def main():
     # Parse the arguments
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
 
     try:
-        # Validate both files have the correct extension
+        # Validate the settings file has the correct extension
         for file_path in [args.settings]:
-            if not file_path.endswith((".yaml", ".yml")):
+            if file_path.rpartition(".")[2].lower() not in _YAML_EXTS:
                 raise ValueError(
                     f"The file '{file_path}' is not a valid YAML file (must have .yaml or .yml extension)."
                 )
 
-        if validate_settings_file(args.settings):
-            machines_settings = settings_read(args.settings)
+        # Parse once (cached), then pass the parsed object around
+        _stream_check_settings(args.settings)
+        content = _load_yaml(args.settings)
+
+        machines_settings = process_settings(content, plain=args.plain)
+        if machines_settings:
+            # Deferred: pulls in the whole Rich display stack
+            from display import simulation
+
             machines_settings = update_machine_file(machines_settings)
             mode = choose_simulation_mode()
             simulation(machines_settings, mode)